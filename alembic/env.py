@@ -6,6 +6,7 @@ from alembic import context
 from app.core.database import Base
 import app.models.dish
 import app.models.order
+import app.models.outbox
 
 config = context.config
 fileConfig(config.config_file_name)
@@ -0,0 +1,34 @@
+"""Add customer_name/order_time index on orders
+
+Revision ID: 7c1d2e9a4b3f
+Revises: 44f62a838daf
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c1d2e9a4b3f'
+down_revision: Union[str, None] = '44f62a838daf'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_orders_customer_name_order_time',
+        'orders',
+        ['customer_name', sa.text('order_time DESC'), sa.text('id DESC')],
+        unique=False,
+        postgresql_ops={'customer_name': 'text_pattern_ops'},
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_orders_customer_name_order_time', table_name='orders')
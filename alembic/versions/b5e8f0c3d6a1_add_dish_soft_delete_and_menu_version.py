@@ -0,0 +1,40 @@
+"""Add dish soft-delete and menu version
+
+Revision ID: b5e8f0c3d6a1
+Revises: 7c1d2e9a4b3f
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5e8f0c3d6a1'
+down_revision: Union[str, None] = '7c1d2e9a4b3f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(sa.schema.CreateSequence(sa.Sequence('menu_version_seq')))
+    op.add_column('dishes', sa.Column('is_active', sa.Boolean(), server_default=sa.true(), nullable=False))
+    op.add_column('dishes', sa.Column('deleted_at', sa.DateTime(), nullable=True))
+    op.add_column('dishes', sa.Column('version', sa.BigInteger(),
+                                      server_default=sa.text("nextval('menu_version_seq')"), nullable=False))
+    op.create_index(op.f('ix_dishes_version'), 'dishes', ['version'], unique=False)
+    op.create_index('ix_dishes_active', 'dishes', ['id'], unique=False,
+                    postgresql_where=sa.text('is_active'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_dishes_active', table_name='dishes')
+    op.drop_index(op.f('ix_dishes_version'), table_name='dishes')
+    op.drop_column('dishes', 'version')
+    op.drop_column('dishes', 'deleted_at')
+    op.drop_column('dishes', 'is_active')
+    op.execute(sa.schema.DropSequence(sa.Sequence('menu_version_seq')))
@@ -0,0 +1,29 @@
+"""Add outbox processed_at index
+
+Revision ID: e4b9a1d7c2f5
+Revises: d2a7c4e1f9b8
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4b9a1d7c2f5'
+down_revision: Union[str, None] = 'd2a7c4e1f9b8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_outbox_events_processed_at', 'outbox_events', ['processed_at'], unique=False,
+                    postgresql_where=sa.text('processed_at IS NOT NULL'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_outbox_events_processed_at', table_name='outbox_events')
@@ -1,7 +1,9 @@
 from fastapi import APIRouter
 
-from app.api.endpoints import dish, order
+from app.api.endpoints import customer, dish, order, stats
 
 api_router = APIRouter()
 api_router.include_router(dish.router, prefix="/dishes", tags=["dishes"])
 api_router.include_router(order.router, prefix="/orders", tags=["orders"])
+api_router.include_router(customer.router, prefix="/customers", tags=["customers"])
+api_router.include_router(stats.router, prefix="/stats", tags=["stats"])
@@ -0,0 +1,56 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from typing import Sequence, List
+
+from app.core import database
+from app.schemas.order import OrderPage
+from app.services.order_service import OrderService
+
+router = APIRouter()
+
+
+@router.get("/", response_model=List[str])
+async def search_customers(prefix: str = Query(..., min_length=1),
+                           limit: int = Query(20, ge=1, le=100),
+                           session: Session = Depends(database.get_db)) -> Sequence[str]:
+    """
+    Найти клиентов по префиксу имени.
+
+    Args:
+        prefix (str): Начало имени клиента.
+        limit (int): Максимальное количество имён в ответе.
+        session (Session): Сессия базы данных.
+
+    Returns:
+        Sequence[str]: Список имён клиентов.
+    """
+    service = OrderService(session)
+    return await service.search_customers(prefix, limit)
+
+
+@router.get("/{customer_name}/orders", response_model=OrderPage)
+async def get_customer_orders(customer_name: str,
+                              limit: int = Query(20, ge=1, le=100),
+                              cursor: str | None = None,
+                              session: Session = Depends(database.get_db)) -> OrderPage:
+    """
+    Получить историю заказов клиента, от новых к старым.
+
+    Args:
+        customer_name (str): Имя клиента.
+        limit (int): Максимальное количество заказов на странице.
+        cursor (str | None): Курсор следующей страницы из предыдущего ответа.
+        session (Session): Сессия базы данных.
+
+    Raises:
+        HTTPException: Если курсор имеет неверный формат (400).
+
+    Returns:
+        OrderPage: Страница заказов и курсор следующей страницы.
+    """
+    service = OrderService(session)
+    try:
+        orders, next_cursor = await service.get_by_customer(customer_name, limit, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return OrderPage(items=orders, next_cursor=next_cursor)
@@ -1,8 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import Sequence, List, Dict
+from tempfile import SpooledTemporaryFile
+from typing import Sequence, List, Dict, Iterator
 
-from app.schemas.dish import DishCreate, DishRead
+from app.schemas.dish import DishCreate, DishRead, DishImportResult, DishChanges
 from app.models.dish import Dish
 from app.core import database
 from app.services.dish_service import DishService
@@ -25,6 +28,29 @@ async def get_dishes(session: Session = Depends(database.get_db)) -> Sequence[Di
     return await service.get_all()
 
 
+@router.get("/changes", response_model=DishChanges)
+async def get_dish_changes(since_version: int = Query(0, ge=0),
+                           limit: int = Query(500, ge=1, le=1000),
+                           session: Session = Depends(database.get_db)) -> DishChanges:
+    """
+    Получить блюда, изменённые после указанной версии меню, включая удалённые.
+
+    Клиент сохраняет `version` из ответа и передаёт её в следующем запросе,
+    пока `has_more` равно True.
+
+    Args:
+        since_version (int): Последняя известная клиенту версия меню.
+        limit (int): Максимальное количество блюд в ответе.
+        session (Session): Сессия базы данных.
+
+    Returns:
+        DishChanges: Изменённые блюда и версия меню для следующего запроса.
+    """
+    service = DishService(session)
+    dishes, version, has_more = await service.get_changes(since_version, limit)
+    return DishChanges(version=version, has_more=has_more, dishes=dishes)
+
+
 @router.post("/", response_model=DishRead)
 async def create_dish(dish: DishCreate, session: Session = Depends(database.get_db)) -> Dish:
     """
@@ -41,6 +67,60 @@ async def create_dish(dish: DishCreate, session: Session = Depends(database.get_
     return await service.create(dish)
 
 
+@router.post("/import", response_model=DishImportResult)
+async def import_dishes(request: Request, dry_run: bool = False,
+                        session: Session = Depends(database.get_db)) -> DishImportResult:
+    """
+    Импортировать меню из CSV, переданного в теле запроса (Content-Type: text/csv).
+
+    Тело читается потоком во временный файл, который остаётся в памяти только
+    до 1 МБ, поэтому размер загружаемого файла не ограничен памятью процесса.
+
+    Args:
+        request (Request): Запрос с CSV в теле.
+        dry_run (bool): Только показать, сколько блюд будет добавлено и изменено.
+        session (Session): Сессия базы данных.
+
+    Raises:
+        HTTPException: При ошибках в заголовке или данных CSV (400).
+
+    Returns:
+        DishImportResult: Количество добавленных, обновлённых и неизменных блюд.
+    """
+    service = DishService(session)
+    with SpooledTemporaryFile(max_size=1024 * 1024) as file:
+        # После 1 МБ файл пишется на диск: запись тоже выполняется вне цикла событий.
+        async for chunk in request.stream():
+            await run_in_threadpool(file.write, chunk)
+        file.seek(0)
+        try:
+            # COPY и upsert выполняются синхронно: уводим их из цикла событий.
+            result = await run_in_threadpool(service.import_csv, file, dry_run)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    return DishImportResult(dry_run=dry_run, **result)
+
+
+@router.get("/export")
+async def export_dishes() -> StreamingResponse:
+    """
+    Выгрузить меню в CSV потоком.
+
+    Returns:
+        StreamingResponse: CSV-файл со всеми блюдами.
+    """
+    def stream() -> Iterator[str]:
+        # Сессия открывается внутри генератора: ответ отдаётся уже после выхода из зависимостей.
+        with database.SessionLocal() as session:
+            yield from DishService(session).export_csv()
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/csv",
+        headers={"Content-Disposition": "attachment; filename=dishes.csv"},
+    )
+
+
 @router.delete("/{dish_id}")
 async def delete_dish(dish_id: int, session: Session = Depends(database.get_db)) -> Dict[str, str]:
     """
@@ -0,0 +1,40 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from app.core import database
+from app.core.stats import live_stats, WINDOW_BUCKETS
+from app.core.tasks import task_queue
+from app.schemas.stats import LiveStatsRead, TaskQueueStatsRead
+
+router = APIRouter()
+
+
+@router.get("/live", response_model=LiveStatsRead)
+async def get_live_stats(hours: int = Query(WINDOW_BUCKETS, ge=1, le=WINDOW_BUCKETS),
+                         limit: int = Query(10, ge=1, le=50)) -> LiveStatsRead:
+    """
+    Получить текущую статистику заказов без обращения к базе данных.
+
+    Args:
+        hours (int): Окно (в часах) для подсчёта популярности блюд.
+        limit (int): Количество самых популярных блюд в ответе.
+
+    Returns:
+        LiveStatsRead: Количество заказов по статусам и самые популярные блюда.
+    """
+    status_counts, top_dishes = live_stats.snapshot(hours, limit)
+    return LiveStatsRead(window_hours=hours, status_counts=status_counts, top_dishes=top_dishes)
+
+
+@router.get("/tasks", response_model=TaskQueueStatsRead)
+async def get_task_stats(session: Session = Depends(database.get_db)) -> TaskQueueStatsRead:
+    """
+    Получить метрики фоновых задач: глубину очереди, задержку и число необработанных событий.
+
+    Args:
+        session (Session): Сессия базы данных.
+
+    Returns:
+        TaskQueueStatsRead: Метрики очереди фоновых задач.
+    """
+    return TaskQueueStatsRead(**task_queue.metrics(session))
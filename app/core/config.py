@@ -11,3 +11,9 @@ DATABASE_PORT = int(os.getenv('DATABASE_PORT'))
 DATABASE_NAME = os.getenv('DATABASE_NAME')
 
 SQLALCHEMY_DATABASE_URL = f"postgresql://{DATABASE_USERNAME}:{DATABASE_PASSWORD}@{DATABASE_HOST}/{DATABASE_NAME}"
+
+# Фоновые задачи (outbox)
+TASK_WORKERS = int(os.getenv('TASK_WORKERS', 4))
+TASK_QUEUE_SIZE = int(os.getenv('TASK_QUEUE_SIZE', 100))
+TASK_MAX_ATTEMPTS = int(os.getenv('TASK_MAX_ATTEMPTS', 10))
+TASK_RETENTION_HOURS = int(os.getenv('TASK_RETENTION_HOURS', 72))
@@ -0,0 +1,231 @@
+import threading
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.future import select
+from sqlalchemy.orm import Session
+
+from app.models.order import Order, order_dishes
+from app.core.logger import logger
+
+BUCKET_SECONDS = 3600
+WINDOW_BUCKETS = 24
+TOP_CAPACITY = 64
+
+
+class SpaceSaving:
+    """
+    Ограниченный по памяти подсчёт самых частых элементов (алгоритм Space-Saving).
+
+    Хранит не более `capacity` счётчиков. Для каждого элемента известна оценка
+    частоты сверху (`count`) и максимальная ошибка этой оценки (`error`).
+    """
+
+    def __init__(self, capacity: int = TOP_CAPACITY) -> None:
+        self.capacity = capacity
+        self.counts: Dict[int, int] = {}
+        self.errors: Dict[int, int] = {}
+
+    def add(self, key: int, count: int = 1) -> None:
+        """
+        Учесть появление элемента.
+
+        Если счётчиков уже `capacity`, вытесняется элемент с минимальным счётчиком,
+        а новый элемент наследует его значение в качестве ошибки.
+
+        Args:
+            key (int): Элемент (ID блюда).
+            count (int): На сколько увеличить счётчик.
+        """
+        if key in self.counts:
+            self.counts[key] += count
+            return
+        if len(self.counts) < self.capacity:
+            self.counts[key] = count
+            self.errors[key] = 0
+            return
+        victim = min(self.counts, key=self.counts.__getitem__)
+        floor = self.counts.pop(victim)
+        self.errors.pop(victim)
+        self.counts[key] = floor + count
+        self.errors[key] = floor
+
+    def floor(self) -> int:
+        """
+        Верхняя граница частоты любого элемента, для которого нет счётчика.
+        """
+        if len(self.counts) < self.capacity:
+            return 0
+        return min(self.counts.values())
+
+    def remove(self, key: int, count: int = 1) -> None:
+        """
+        Уменьшить счётчик элемента (например, при отмене заказа).
+
+        Если счётчика для элемента нет, ничего не происходит.
+
+        Args:
+            key (int): Элемент (ID блюда).
+            count (int): На сколько уменьшить счётчик.
+        """
+        if key in self.counts:
+            self.counts[key] = max(self.counts[key] - count, 0)
+
+
+class LiveStats:
+    """
+    Статистика заказов в памяти процесса: точные счётчики по статусам и
+    самые популярные блюда по часовым корзинам за последние сутки.
+    """
+
+    def __init__(self, capacity: int = TOP_CAPACITY) -> None:
+        """
+        Инициализация статистики.
+
+        Args:
+            capacity (int): Количество счётчиков блюд в каждой часовой корзине.
+        """
+        self.capacity = capacity
+        self._lock = threading.Lock()
+        self.status_counts: Dict[str, int] = defaultdict(int)
+        self.buckets: Dict[int, SpaceSaving] = {}
+
+    @staticmethod
+    def _bucket_of(moment: datetime) -> int:
+        return int(moment.timestamp()) // BUCKET_SECONDS
+
+    def _bucket(self, moment: datetime) -> SpaceSaving:
+        """
+        Получить (или создать) корзину для момента времени.
+
+        При создании новой корзины удаляются корзины, вышедшие за окно WINDOW_BUCKETS.
+
+        Args:
+            moment (datetime): Время заказа.
+
+        Returns:
+            SpaceSaving: Сводка популярности блюд за час, в который попадает `moment`.
+        """
+        bucket_id = self._bucket_of(moment)
+        bucket = self.buckets.get(bucket_id)
+        if bucket is None:
+            bucket = self.buckets[bucket_id] = SpaceSaving(self.capacity)
+            oldest = bucket_id - WINDOW_BUCKETS
+            for stale in [b for b in self.buckets if b <= oldest]:
+                del self.buckets[stale]
+        return bucket
+
+    def record_created(self, status: str, order_time: datetime, dish_ids: Iterable[int]) -> None:
+        """
+        Учесть новый заказ.
+
+        Args:
+            status (str): Статус заказа.
+            order_time (datetime): Время заказа.
+            dish_ids (Iterable[int]): ID блюд заказа.
+        """
+        with self._lock:
+            self.status_counts[status] += 1
+            bucket = self._bucket(order_time)
+            for dish_id in dish_ids:
+                bucket.add(dish_id)
+
+    def record_status_change(self, old_status: str, new_status: str) -> None:
+        """
+        Учесть смену статуса заказа.
+
+        Args:
+            old_status (str): Прежний статус.
+            new_status (str): Новый статус.
+        """
+        with self._lock:
+            self.status_counts[old_status] = max(self.status_counts[old_status] - 1, 0)
+            self.status_counts[new_status] += 1
+
+    def record_deleted(self, status: str, order_time: datetime, dish_ids: Iterable[int]) -> None:
+        """
+        Учесть отмену (удаление) заказа.
+
+        Популярность блюд уменьшается, только если корзина заказа ещё в окне.
+
+        Args:
+            status (str): Статус удалённого заказа.
+            order_time (datetime): Время заказа.
+            dish_ids (Iterable[int]): ID блюд заказа.
+        """
+        with self._lock:
+            self.status_counts[status] = max(self.status_counts[status] - 1, 0)
+            bucket = self.buckets.get(self._bucket_of(order_time))
+            if bucket is not None:
+                for dish_id in dish_ids:
+                    bucket.remove(dish_id)
+
+    def snapshot(self, hours: int = WINDOW_BUCKETS, limit: int = 10) -> Tuple[Dict[str, int], List[dict]]:
+        """
+        Получить текущие счётчики статусов и топ блюд за последние `hours` часов.
+
+        Стоимость не зависит от числа заказов: объединяется не более
+        WINDOW_BUCKETS корзин по TOP_CAPACITY счётчиков.
+
+        `error` — максимальная ошибка `count`: сумма ошибок счётчиков блюда и,
+        для заполненных корзин, где счётчика блюда нет, минимального счётчика
+        корзины (столько заказов блюда могло быть вытеснено).
+
+        Args:
+            hours (int): Окно (в часах) для подсчёта популярности блюд.
+            limit (int): Количество самых популярных блюд в ответе.
+
+        Returns:
+            Tuple[Dict[str, int], List[dict]]: Количество заказов по статусам и топ блюд.
+        """
+        newest = self._bucket_of(datetime.now())
+        merged: Dict[int, List[int]] = defaultdict(lambda: [0, 0])
+        with self._lock:
+            statuses = {status: count for status, count in self.status_counts.items() if count}
+            window = [bucket for bucket_id, bucket in self.buckets.items()
+                      if newest - hours < bucket_id <= newest]
+            for bucket in window:
+                for dish_id, count in bucket.counts.items():
+                    merged[dish_id][0] += count
+                    merged[dish_id][1] += bucket.errors[dish_id]
+            for bucket in window:
+                floor = bucket.floor()
+                if floor:
+                    for dish_id, totals in merged.items():
+                        if dish_id not in bucket.counts:
+                            totals[1] += floor
+        top = sorted(merged.items(), key=lambda item: item[1][0], reverse=True)[:limit]
+        return statuses, [
+            {"dish_id": dish_id, "count": count, "error": error}
+            for dish_id, (count, error) in top if count
+        ]
+
+    def rebuild(self, session: Session) -> None:
+        """
+        Пересчитать статистику по базе данных (вызывается при старте приложения).
+
+        Args:
+            session (Session): Сессия базы данных.
+        """
+        logger.info("Восстановление статистики заказов из базы данных")
+        since = datetime.now() - timedelta(seconds=BUCKET_SECONDS * WINDOW_BUCKETS)
+        status_rows = session.execute(
+            select(Order.status, func.count()).group_by(Order.status)
+        ).all()
+        dish_rows = session.execute(
+            select(Order.order_time, order_dishes.c.dish_id)
+            .join(order_dishes, order_dishes.c.order_id == Order.id)
+            .where(Order.order_time >= since)
+        ).all()
+
+        with self._lock:
+            self.status_counts = defaultdict(int, {status: count for status, count in status_rows})
+            self.buckets = {}
+            for order_time, dish_id in dish_rows:
+                self._bucket(order_time).add(dish_id)
+        logger.debug(f"Статистика восстановлена: статусов {len(status_rows)}, позиций {len(dish_rows)}")
+
+
+live_stats = LiveStats()
@@ -0,0 +1,376 @@
+import asyncio
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import func, update, delete
+from sqlalchemy.future import select
+from sqlalchemy.orm import Session
+
+from app.core import config
+from app.core.database import SessionLocal
+from app.core.logger import logger
+from app.models.outbox import OutboxEvent
+
+Handler = Callable[[Dict[str, Any]], Awaitable[None]]
+
+POLL_INTERVAL_SECONDS = 5.0
+LEASE_SECONDS = 60
+BACKOFF_BASE_SECONDS = 2
+BACKOFF_MAX_SECONDS = 600
+STOP_TIMEOUT_SECONDS = 10.0
+CLEANUP_INTERVAL_SECONDS = 600
+CLEANUP_BATCH_SIZE = 1000
+
+
+class TaskQueue:
+    """
+    Фоновая обработка событий из таблицы outbox_events.
+
+    События записываются в той же транзакции, что и заказ. Опрашивающая задача
+    забирает готовые события (FOR UPDATE SKIP LOCKED), продлевает им аренду
+    и кладёт в ограниченную asyncio-очередь, из которой их берут воркеры.
+    Когда воркер берёт событие из очереди, аренда продлевается, а пока событие
+    находится в очереди процесса, повторно оно не забирается. Если воркер упал
+    или процесс остановился, событие будет выдано повторно после окончания
+    аренды (доставка "как минимум один раз"), поэтому обработчики должны быть
+    идемпотентными. Обработанные события старше TASK_RETENTION_HOURS удаляются.
+    """
+
+    def __init__(self, workers: int = config.TASK_WORKERS, maxsize: int = config.TASK_QUEUE_SIZE,
+                 max_attempts: int = config.TASK_MAX_ATTEMPTS,
+                 retention_hours: int = config.TASK_RETENTION_HOURS) -> None:
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.retention = timedelta(hours=retention_hours)
+        self._inflight: Set[int] = set()
+        self._last_cleanup: Optional[datetime] = None
+        self.handlers: Dict[str, Handler] = {}
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self._wakeup = asyncio.Event()
+        self._tasks: List[asyncio.Task] = []
+        self.processed = 0
+        self.failed = 0
+        self.last_lag_seconds: Optional[float] = None
+
+    def handler(self, event_type: str) -> Callable[[Handler], Handler]:
+        """
+        Зарегистрировать обработчик для типа события.
+
+        Args:
+            event_type (str): Тип события, например "order_created".
+
+        Returns:
+            Callable[[Handler], Handler]: Декоратор для асинхронной функции обработчика.
+        """
+        def register(func: Handler) -> Handler:
+            self.handlers[event_type] = func
+            return func
+        return register
+
+    def notify(self) -> None:
+        """
+        Сообщить о новых событиях, чтобы не ждать следующего опроса базы.
+        """
+        self._wakeup.set()
+
+    async def start(self) -> None:
+        """
+        Запустить опрос outbox и воркеров в текущем цикле событий.
+        """
+        self.queue = asyncio.Queue(maxsize=self.queue.maxsize)
+        self._wakeup = asyncio.Event()
+        self._inflight = set()
+        logger.info(f"Запуск фоновых задач: воркеров {self.workers}, размер очереди {self.queue.maxsize}")
+        self._tasks = [asyncio.create_task(self._poll())]
+        self._tasks += [asyncio.create_task(self._work()) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        """
+        Остановить опрос базы и дождаться обработки уже взятых событий.
+        """
+        if not self._tasks:
+            return
+        poller, workers = self._tasks[0], self._tasks[1:]
+        poller.cancel()
+        try:
+            await asyncio.wait_for(self.queue.join(), timeout=STOP_TIMEOUT_SECONDS)
+        except asyncio.TimeoutError:
+            logger.warning(f"Не дождались обработки событий: в очереди {self.queue.qsize()}")
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        logger.info("Фоновые задачи остановлены")
+
+    def metrics(self, session: Session) -> Dict[str, Any]:
+        """
+        Получить метрики очереди: глубину, задержку обработки, число ожидающих
+        событий и событий, исчерпавших попытки.
+
+        Args:
+            session (Session): Сессия базы данных.
+
+        Returns:
+            Dict[str, Any]: Метрики фоновых задач.
+        """
+        alive = OutboxEvent.attempts < self.max_attempts
+        pending, dead, oldest = session.execute(
+            select(
+                func.count().filter(alive),
+                func.count().filter(~alive),
+                func.min(OutboxEvent.created_at).filter(alive),
+            )
+            .where(OutboxEvent.processed_at.is_(None))
+        ).one()
+        return {
+            "workers": self.workers,
+            "queue_depth": self.queue.qsize(),
+            "queue_size": self.queue.maxsize,
+            "processed": self.processed,
+            "failed": self.failed,
+            "last_lag_seconds": self.last_lag_seconds,
+            "pending": pending,
+            "dead": dead,
+            "oldest_pending_seconds": (datetime.now() - oldest).total_seconds() if oldest else None,
+        }
+
+    async def _poll(self) -> None:
+        """
+        Забирать готовые события из outbox в очередь, пока в ней есть место.
+
+        Просыпается по notify() или раз в POLL_INTERVAL_SECONDS; заодно
+        запускает очистку устаревших обработанных событий.
+        """
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=POLL_INTERVAL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self._cleanup()
+
+            free_slots = self.queue.maxsize - self.queue.qsize()
+            while free_slots > 0:
+                try:
+                    events = await asyncio.to_thread(self._claim, free_slots, list(self._inflight))
+                except Exception as e:
+                    logger.error(f"Ошибка при получении событий из outbox: {e}")
+                    break
+                for event in events:
+                    self._inflight.add(event[0])
+                    await self.queue.put(event)
+                if len(events) < free_slots:
+                    break
+                free_slots = self.queue.maxsize - self.queue.qsize()
+
+    async def _work(self) -> None:
+        """
+        Брать события из очереди и передавать их обработчикам.
+
+        Если продлить аренду или сохранить результат не удалось, событие остаётся
+        в outbox и будет выдано повторно после окончания аренды.
+        """
+        while True:
+            event_id, event_type, payload, created_at = await self.queue.get()
+            try:
+                try:
+                    renewed = await asyncio.to_thread(self._renew_lease, event_id)
+                except Exception as e:
+                    logger.error(f"Не удалось продлить аренду события {event_id}: {e}")
+                    continue
+                if not renewed:
+                    logger.debug(f"Событие {event_id} уже обработано, пропускаем")
+                    continue
+                try:
+                    await self._handle(event_id, event_type, payload, created_at)
+                except Exception as e:
+                    logger.error(f"Не удалось сохранить результат обработки события {event_id}: {e}")
+            finally:
+                self._inflight.discard(event_id)
+                self.queue.task_done()
+
+    async def _handle(self, event_id: int, event_type: str, payload: Dict[str, Any],
+                      created_at: datetime) -> None:
+        """
+        Вызвать обработчик события и записать результат в outbox.
+
+        Ошибка обработчика не пробрасывается: попытка засчитывается в _mark_failed.
+        Пробрасываются только ошибки записи результата в базу.
+
+        Args:
+            event_id (int): ID события.
+            event_type (str): Тип события.
+            payload (Dict[str, Any]): Данные события.
+            created_at (datetime): Время создания события (для метрики задержки).
+        """
+        try:
+            handler = self.handlers.get(event_type)
+            if handler is None:
+                raise LookupError(f"Нет обработчика для события '{event_type}'")
+            await handler(payload)
+        except Exception as e:
+            self.failed += 1
+            logger.error(f"Ошибка при обработке события {event_id} ({event_type}): {e}")
+            await asyncio.to_thread(self._mark_failed, event_id, str(e))
+        else:
+            self.processed += 1
+            self.last_lag_seconds = (datetime.now() - created_at).total_seconds()
+            await asyncio.to_thread(self._mark_processed, event_id)
+
+    async def _cleanup(self) -> None:
+        """
+        Удалить обработанные события старше срока хранения, не чаще CLEANUP_INTERVAL_SECONDS.
+        """
+        now = datetime.now()
+        if self._last_cleanup and now - self._last_cleanup < timedelta(seconds=CLEANUP_INTERVAL_SECONDS):
+            return
+        self._last_cleanup = now
+        try:
+            removed = await asyncio.to_thread(self._delete_processed, now - self.retention)
+        except Exception as e:
+            logger.error(f"Ошибка при очистке outbox: {e}")
+            return
+        if removed:
+            logger.info(f"Удалено обработанных событий outbox: {removed}")
+
+    @staticmethod
+    def _delete_processed(before: datetime) -> int:
+        """
+        Удалить события, обработанные раньше `before`, пачками по CLEANUP_BATCH_SIZE.
+
+        Args:
+            before (datetime): Граница срока хранения.
+
+        Returns:
+            int: Количество удалённых событий.
+        """
+        removed = 0
+        with SessionLocal() as session:
+            while True:
+                batch = (
+                    select(OutboxEvent.id)
+                    .where(OutboxEvent.processed_at < before)
+                    .limit(CLEANUP_BATCH_SIZE)
+                    .scalar_subquery()
+                )
+                deleted = session.execute(delete(OutboxEvent).where(OutboxEvent.id.in_(batch))).rowcount
+                session.commit()
+                removed += deleted
+                if deleted < CLEANUP_BATCH_SIZE:
+                    return removed
+
+    def _claim(self, limit: int, exclude: List[int]) -> List[Tuple[int, str, Dict[str, Any], datetime]]:
+        """
+        Забрать готовые к обработке события и выдать на них аренду.
+
+        Строки блокируются FOR UPDATE SKIP LOCKED, поэтому несколько процессов не
+        заберут одно событие одновременно. Аренда — это перенос available_at на
+        LEASE_SECONDS вперёд: пока она не истекла, событие никто не заберёт, а если
+        процесс упадёт, событие снова станет доступно. События, уже лежащие
+        в очереди этого процесса (`exclude`), не забираются повторно, даже если
+        их аренда истекла.
+
+        Args:
+            limit (int): Максимальное количество событий.
+            exclude (List[int]): ID событий, уже находящихся в очереди процесса.
+
+        Returns:
+            List[Tuple[int, str, Dict[str, Any], datetime]]: ID, тип, данные и время создания событий.
+        """
+        now = datetime.now()
+        with SessionLocal() as session:
+            events = session.execute(
+                select(OutboxEvent)
+                .where(
+                    OutboxEvent.processed_at.is_(None),
+                    OutboxEvent.available_at <= now,
+                    OutboxEvent.attempts < self.max_attempts,
+                    OutboxEvent.id.notin_(exclude),
+                )
+                .order_by(OutboxEvent.available_at)
+                .limit(limit)
+                .with_for_update(skip_locked=True)
+            ).scalars().all()
+            for event in events:
+                event.available_at = now + timedelta(seconds=LEASE_SECONDS)
+            claimed = [(event.id, event.event_type, event.payload, event.created_at) for event in events]
+            session.commit()
+        return claimed
+
+    @staticmethod
+    def _renew_lease(event_id: int) -> bool:
+        """
+        Продлить аренду события в момент, когда его взял воркер.
+
+        Аренда выдаётся при заборе в очередь, и при большой очереди она может
+        истечь до начала обработки. Продление отсчитывает LEASE_SECONDS от начала
+        обработки, чтобы событие не забрал другой процесс.
+
+        Args:
+            event_id (int): ID события.
+
+        Returns:
+            bool: False, если событие уже обработано (например, другим процессом).
+        """
+        with SessionLocal() as session:
+            renewed = session.execute(
+                update(OutboxEvent)
+                .where(OutboxEvent.id == event_id, OutboxEvent.processed_at.is_(None))
+                .values(available_at=datetime.now() + timedelta(seconds=LEASE_SECONDS))
+            ).rowcount
+            session.commit()
+        return bool(renewed)
+
+    @staticmethod
+    def _mark_processed(event_id: int) -> None:
+        """
+        Отметить событие обработанным.
+
+        Args:
+            event_id (int): ID события.
+        """
+        with SessionLocal() as session:
+            event = session.get(OutboxEvent, event_id)
+            event.processed_at = datetime.now()
+            session.commit()
+
+    def _mark_failed(self, event_id: int, error: str) -> None:
+        """
+        Засчитать неудачную попытку и отложить событие с экспоненциальной задержкой.
+
+        После TASK_MAX_ATTEMPTS попыток событие больше не забирается и
+        учитывается в метрике `dead`.
+
+        Args:
+            event_id (int): ID события.
+            error (str): Текст ошибки обработчика.
+        """
+        with SessionLocal() as session:
+            event = session.get(OutboxEvent, event_id)
+            event.attempts += 1
+            event.last_error = error
+            delay = min(BACKOFF_BASE_SECONDS * 2 ** event.attempts, BACKOFF_MAX_SECONDS)
+            event.available_at = datetime.now() + timedelta(seconds=delay)
+            if event.attempts >= self.max_attempts:
+                logger.error(f"Событие {event_id} не обработано после {event.attempts} попыток")
+            session.commit()
+
+
+task_queue = TaskQueue()
+
+
+def add_event(session: Session, event_type: str, payload: Dict[str, Any]) -> OutboxEvent:
+    """
+    Добавить событие в outbox в рамках текущей транзакции сессии.
+
+    Args:
+        session (Session): Сессия базы данных, в которой выполняется основная операция.
+        event_type (str): Тип события.
+        payload (Dict[str, Any]): Данные события (должны сериализоваться в JSON).
+
+    Returns:
+        OutboxEvent: Добавленное в сессию событие.
+    """
+    event = OutboxEvent(event_type=event_type, payload=payload)
+    session.add(event)
+    return event
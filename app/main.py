@@ -1,5 +1,21 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+
 from app.api.api import api_router
+from app.core.database import SessionLocal
+from app.core.stats import live_stats
+from app.core.tasks import task_queue
+from app.services import order_events  # noqa: F401
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    with SessionLocal() as session:
+        live_stats.rebuild(session)
+    await task_queue.start()
+    yield
+    await task_queue.stop()
+
 
 app = FastAPI(
     title='FastAPI-Restaurant',
@@ -17,7 +33,8 @@ app = FastAPI(
 ---
 
 Приятного использования API!
-"""
+""",
+    lifespan=lifespan,
 )
 
 app.include_router(api_router)
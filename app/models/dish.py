@@ -1,7 +1,10 @@
-from sqlalchemy import Column, Integer, String, Float
+from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, BigInteger, Sequence, Index, true
 
 from app.core.database import Base
 
+# Версия меню: увеличивается при каждом изменении блюда (создание, обновление, удаление).
+menu_version = Sequence("menu_version_seq", metadata=Base.metadata)
+
 
 class Dish(Base):
     __tablename__ = "dishes"
@@ -11,3 +14,11 @@ class Dish(Base):
     description = Column(String, nullable=True)
     price = Column(Float, nullable=False)
     category = Column(String, nullable=False)
+    is_active = Column(Boolean, nullable=False, default=True, server_default=true())
+    deleted_at = Column(DateTime, nullable=True)
+    version = Column(BigInteger, menu_version, server_default=menu_version.next_value(),
+                     onupdate=menu_version.next_value(), nullable=False, index=True)
+
+    __table_args__ = (
+        Index("ix_dishes_active", id, postgresql_where=is_active),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Table, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Table, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 
@@ -21,3 +21,15 @@ class Order(Base):
     status = Column(String, default="в обработке")
 
     dishes = relationship("Dish", secondary=order_dishes, backref="orders")
+
+    # История заказов клиента: точный поиск и поиск по префиксу имени (text_pattern_ops),
+    # сортировка по времени без отдельного шага сортировки.
+    __table_args__ = (
+        Index(
+            "ix_orders_customer_name_order_time",
+            customer_name,
+            order_time.desc(),
+            id.desc(),
+            postgresql_ops={"customer_name": "text_pattern_ops"},
+        ),
+    )
@@ -0,0 +1,24 @@
+from sqlalchemy import Column, Integer, String, DateTime, JSON, Index
+from datetime import datetime
+
+from app.core.database import Base
+
+
+class OutboxEvent(Base):
+    __tablename__ = "outbox_events"
+
+    id = Column(Integer, primary_key=True, index=True)
+    event_type = Column(String, nullable=False)
+    payload = Column(JSON, nullable=False)
+    created_at = Column(DateTime, nullable=False, default=datetime.now)
+    available_at = Column(DateTime, nullable=False, default=datetime.now)
+    attempts = Column(Integer, nullable=False, default=0)
+    last_error = Column(String, nullable=True)
+    processed_at = Column(DateTime, nullable=True)
+
+    # Очередь необработанных событий: выборка готовых к обработке без просмотра истории;
+    # обработанные события: удаление устаревших по сроку хранения.
+    __table_args__ = (
+        Index("ix_outbox_events_pending", available_at, postgresql_where=processed_at.is_(None)),
+        Index("ix_outbox_events_processed_at", processed_at, postgresql_where=processed_at.isnot(None)),
+    )
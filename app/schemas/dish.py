@@ -1,4 +1,6 @@
 from pydantic import BaseModel, Field, ConfigDict
+from typing import List
+from datetime import datetime
 
 
 class DishBase(BaseModel):
@@ -17,3 +19,22 @@ class DishRead(DishBase):
     id: int
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class DishImportResult(BaseModel):
+    dry_run: bool
+    inserted: int = Field(..., json_schema_extra={"example": 120})
+    updated: int = Field(..., json_schema_extra={"example": 35})
+    unchanged: int = Field(..., json_schema_extra={"example": 845})
+
+
+class DishChangeRead(DishRead):
+    is_active: bool
+    deleted_at: datetime | None = None
+    version: int
+
+
+class DishChanges(BaseModel):
+    version: int = Field(..., json_schema_extra={"example": 1024})
+    has_more: bool
+    dishes: List[DishChangeRead]
@@ -32,3 +32,8 @@ class OrderStatusUpdate(BaseModel):
         if v not in allowed_statuses:
             raise ValueError(f"Статус должен быть одним из {allowed_statuses}")
         return v
+
+
+class OrderPage(BaseModel):
+    items: List[OrderRead]
+    next_cursor: str | None = Field(None, json_schema_extra={"example": "2025-06-19T13:32:25.848974,42"})
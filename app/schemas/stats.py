@@ -0,0 +1,26 @@
+from pydantic import BaseModel, Field
+from typing import Dict, List, Optional
+
+
+class DishPopularity(BaseModel):
+    dish_id: int = Field(..., json_schema_extra={"example": 1})
+    count: int = Field(..., json_schema_extra={"example": 42})
+    error: int = Field(..., json_schema_extra={"example": 0})
+
+
+class LiveStatsRead(BaseModel):
+    window_hours: int = Field(..., json_schema_extra={"example": 24})
+    status_counts: Dict[str, int] = Field(..., json_schema_extra={"example": {"в обработке": 3, "готовится": 1}})
+    top_dishes: List[DishPopularity]
+
+
+class TaskQueueStatsRead(BaseModel):
+    workers: int = Field(..., json_schema_extra={"example": 4})
+    queue_depth: int = Field(..., json_schema_extra={"example": 0})
+    queue_size: int = Field(..., json_schema_extra={"example": 100})
+    processed: int = Field(..., json_schema_extra={"example": 1250})
+    failed: int = Field(..., json_schema_extra={"example": 2})
+    last_lag_seconds: Optional[float] = Field(None, json_schema_extra={"example": 0.015})
+    pending: int = Field(..., json_schema_extra={"example": 0})
+    dead: int = Field(..., json_schema_extra={"example": 0})
+    oldest_pending_seconds: Optional[float] = Field(None, json_schema_extra={"example": 0.2})
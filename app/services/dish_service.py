@@ -1,13 +1,26 @@
+import csv
+import io
+import psycopg2
+from fastapi.concurrency import run_in_threadpool
+from datetime import datetime
+from sqlalchemy import text, update
 from sqlalchemy.orm import Session
 from sqlalchemy.future import select
 from sqlalchemy.exc import SQLAlchemyError
-from typing import Sequence, Optional
+from typing import Sequence, Optional, BinaryIO, Iterator, Dict, Tuple
 
 from app.models.dish import Dish
 from app.schemas.dish import DishCreate
 from app.core.logger import logger
 
 
+CSV_COLUMNS = ["id", "name", "description", "price", "category"]
+CSV_REQUIRED_COLUMNS = {"name", "price", "category"}
+
+# Ключ advisory-блокировки для всех изменений блюд (см. DishService.lock_menu).
+MENU_WRITE_LOCK = 290_001
+
+
 class DishService:
     def __init__(self, session: Session) -> None:
         """
@@ -18,15 +31,29 @@ class DishService:
         """
         self.session = session
 
+    def lock_menu(self) -> None:
+        """
+        Захватить блокировку изменений меню до конца текущей транзакции.
+
+        Версия меню выдаётся последовательностью при записи, а не при коммите.
+        Без блокировки транзакция с меньшей версией могла бы закоммититься позже
+        транзакции с большей, и клиент /dishes/changes пропустил бы изменение.
+        Под блокировкой изменения блюд коммитятся строго в порядке версий.
+
+        Вызов блокирующий (ждёт, например, окончания импорта CSV), поэтому
+        из асинхронного кода его нужно выполнять в пуле потоков.
+        """
+        self.session.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": MENU_WRITE_LOCK})
+
     async def get_all(self) -> Sequence[Dish]:
         """
-        Получить все блюда из базы данных.
+        Получить все блюда меню (без удалённых).
 
         Returns:
-            Sequence[Dish]: Список всех блюд.
+            Sequence[Dish]: Список всех активных блюд.
         """
         logger.info("Получение всех блюд из базы данных")
-        result = self.session.execute(select(Dish))
+        result = self.session.execute(select(Dish).where(Dish.is_active))
         dishes = result.scalars().all()
         logger.debug(f"Найдено {len(dishes)} блюд")
         return dishes
@@ -64,10 +91,15 @@ class DishService:
         """
         logger.info(f"Создание нового блюда: {dish_create.name}")
         dish = Dish(**dish_create.model_dump())
-        self.session.add(dish)
-        try:
+
+        def write() -> None:
+            self.lock_menu()
+            self.session.add(dish)
             self.session.commit()
             self.session.refresh(dish)
+
+        try:
+            await run_in_threadpool(write)
             logger.debug(f"Блюдо успешно создано с ID: {dish.id}")
         except SQLAlchemyError as e:
             self.session.rollback()
@@ -77,7 +109,10 @@ class DishService:
 
     async def delete(self, dish_id: int) -> bool:
         """
-        Удалить блюдо по идентификатору.
+        Удалить блюдо по идентификатору (мягкое удаление).
+
+        Блюдо помечается неактивным и остаётся в базе, чтобы не ломать связи
+        с заказами и чтобы клиенты получили удаление через /dishes/changes.
 
         Args:
             dish_id (int): Идентификатор блюда для удаления.
@@ -89,16 +124,161 @@ class DishService:
             bool: True, если блюдо было удалено, False если не найдено.
         """
         logger.info(f"Удаление блюда с ID: {dish_id}")
-        dish = await self.get_by_id(dish_id)
-        if dish:
-            self.session.delete(dish)
-            try:
-                self.session.commit()
-                logger.debug(f"Блюдо с ID {dish_id} успешно удалено")
-            except SQLAlchemyError as e:
-                self.session.rollback()
-                logger.error(f"Ошибка при удалении блюда с ID {dish_id}: {e}")
-                raise
+        def write():
+            self.lock_menu()
+            result = self.session.execute(
+                update(Dish)
+                .where(Dish.id == dish_id, Dish.is_active)
+                .values(is_active=False, deleted_at=datetime.now())
+            )
+            self.session.commit()
+            return result
+
+        try:
+            result = await run_in_threadpool(write)
+        except SQLAlchemyError as e:
+            self.session.rollback()
+            logger.error(f"Ошибка при удалении блюда с ID {dish_id}: {e}")
+            raise
+        if result.rowcount:
+            logger.debug(f"Блюдо с ID {dish_id} успешно удалено")
             return True
         logger.warning(f"Попытка удалить несуществующее блюдо с ID {dish_id}")
         return False
+
+    async def get_changes(self, since_version: int, limit: int) -> Tuple[Sequence[Dish], int, bool]:
+        """
+        Получить блюда, изменённые после указанной версии меню, включая удалённые.
+
+        Args:
+            since_version (int): Последняя версия меню, известная клиенту.
+            limit (int): Максимальное количество блюд в ответе.
+
+        Returns:
+            Tuple[Sequence[Dish], int, bool]: Изменённые блюда по возрастанию версии,
+            версия, с которой запрашивать следующую порцию, и признак наличия ещё изменений.
+
+        Версия для следующего запроса берётся из последнего полученного блюда, а не из
+        отдельного max(version): тот мог бы увидеть блюда, закоммиченные после выборки.
+        """
+        logger.info(f"Получение изменений меню после версии {since_version}")
+        result = self.session.execute(
+            select(Dish)
+            .where(Dish.version > since_version)
+            .order_by(Dish.version)
+            .limit(limit + 1)
+        )
+        dishes = result.scalars().all()
+        has_more = len(dishes) > limit
+        dishes = dishes[:limit]
+        version = dishes[-1].version if dishes else since_version
+        logger.debug(f"Найдено изменённых блюд: {len(dishes)}")
+        return dishes, version, has_more
+
+    def import_csv(self, file: BinaryIO, dry_run: bool = False) -> Dict[str, int]:
+        """
+        Загрузить меню из CSV через COPY во временную таблицу и применить одним upsert.
+
+        Строки с существующим id обновляют блюдо (и восстанавливают удалённое),
+        остальные добавляются как новые. Колонки, которых нет в заголовке
+        (например, description), у существующих блюд не меняются.
+
+        Метод синхронный и выполняет долгие запросы: из асинхронного кода
+        его нужно вызывать в отдельном потоке.
+
+        Args:
+            file (BinaryIO): CSV-файл с заголовком (колонки из CSV_COLUMNS, id необязателен).
+            dry_run (bool): Только посчитать изменения, не применяя их.
+
+        Raises:
+            ValueError: Если заголовок или данные CSV некорректны.
+
+        Returns:
+            Dict[str, int]: Количество добавленных, обновлённых и неизменных блюд.
+        """
+        header = next(csv.reader([file.readline().decode("utf-8-sig")]), [])
+        columns = [column.strip() for column in header]
+        if not CSV_REQUIRED_COLUMNS <= set(columns) or not set(columns) <= set(CSV_COLUMNS):
+            raise ValueError(f"Заголовок CSV должен содержать {sorted(CSV_REQUIRED_COLUMNS)} "
+                             f"и только колонки из {CSV_COLUMNS}")
+
+        # Сравниваются и обновляются только колонки из заголовка (имена проверены выше).
+        fields = [column for column in CSV_COLUMNS if column in columns and column != "id"]
+        current = ", ".join(f"d.{field}" for field in fields)
+        staged = ", ".join(f"s.{field}" for field in fields)
+        changed = f"({current}, d.is_active) IS DISTINCT FROM ({staged}, true)"
+
+        logger.info(f"Импорт меню из CSV (dry_run={dry_run})")
+        try:
+            self.session.execute(text(
+                "CREATE TEMP TABLE dishes_import ("
+                " id integer,"
+                " name text NOT NULL,"
+                " description text,"
+                " price double precision NOT NULL CHECK (price > 0),"
+                " category text NOT NULL"
+                ") ON COMMIT DROP"
+            ))
+            with self.session.connection().connection.cursor() as cursor:
+                cursor.copy_expert(
+                    f"COPY dishes_import ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", file
+                )
+
+            if not dry_run:
+                self.lock_menu()
+            diff = self.session.execute(text(
+                "SELECT"
+                " count(*) FILTER (WHERE d.id IS NULL) AS inserted,"
+                f" count(*) FILTER (WHERE d.id IS NOT NULL AND {changed}) AS updated,"
+                f" count(*) FILTER (WHERE d.id IS NOT NULL AND NOT {changed}) AS unchanged"
+                " FROM dishes_import s LEFT JOIN dishes d ON d.id = s.id"
+            )).mappings().one()
+
+            if dry_run:
+                self.session.rollback()
+            else:
+                self.session.execute(text(
+                    f"INSERT INTO dishes (id, {', '.join(fields)}, is_active, version)"
+                    f" SELECT COALESCE(d.id, nextval(pg_get_serial_sequence('dishes', 'id'))), {staged},"
+                    "  true, nextval('menu_version_seq')"
+                    " FROM dishes_import s LEFT JOIN dishes d ON d.id = s.id"
+                    f" WHERE d.id IS NULL OR {changed}"
+                    " ON CONFLICT (id) DO UPDATE SET"
+                    f"  {', '.join(f'{field} = EXCLUDED.{field}' for field in fields)},"
+                    "  is_active = true, deleted_at = NULL, version = EXCLUDED.version"
+                ))
+                self.session.commit()
+        except (SQLAlchemyError, psycopg2.Error) as e:
+            self.session.rollback()
+            logger.error(f"Ошибка при импорте меню из CSV: {e}")
+            raise ValueError(f"Ошибка в данных CSV: {getattr(e, 'orig', e)}")
+
+        logger.debug(f"Импорт меню: {dict(diff)}")
+        return dict(diff)
+
+    def export_csv(self, batch_size: int = 1000) -> Iterator[str]:
+        """
+        Выгрузить все блюда в CSV по частям, не загружая таблицу в память целиком.
+
+        Args:
+            batch_size (int): Количество строк, читаемых из базы за раз.
+
+        Returns:
+            Iterator[str]: Части CSV-файла, начиная с заголовка.
+        """
+        logger.info("Экспорт меню в CSV")
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(CSV_COLUMNS)
+        result = self.session.execute(
+            select(Dish.id, Dish.name, Dish.description, Dish.price, Dish.category)
+            .where(Dish.is_active)
+            .order_by(Dish.id)
+            .execution_options(yield_per=batch_size)
+        )
+        for rows in result.partitions():
+            writer.writerows(rows)
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+        yield buffer.getvalue()
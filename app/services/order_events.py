@@ -0,0 +1,65 @@
+import asyncio
+from typing import Any, Dict, List, Sequence
+
+from sqlalchemy.future import select
+
+from app.core.database import SessionLocal
+from app.core.logger import logger
+from app.core.tasks import task_queue
+from app.models.dish import Dish
+from app.models.order import Order
+
+# Обработчики событий заказов выполняются фоновыми воркерами после коммита заказа:
+# сюда вынесена работа, которой не место на пути запроса (кухонный тикет, чек, журнал).
+# Событие может быть доставлено повторно, поэтому обработчики должны быть идемпотентными.
+
+
+def load_dishes(dish_ids: List[int]) -> Sequence[Dish]:
+    """
+    Загрузить блюда по ID в отдельной сессии (вызывается в пуле потоков).
+
+    Args:
+        dish_ids (List[int]): ID блюд.
+
+    Returns:
+        Sequence[Dish]: Найденные блюда.
+    """
+    with SessionLocal() as session:
+        return session.execute(select(Dish).where(Dish.id.in_(dish_ids))).scalars().all()
+
+
+def load_order_dishes(order_id: int) -> Sequence[Dish]:
+    """
+    Загрузить блюда заказа в отдельной сессии (вызывается в пуле потоков).
+
+    Args:
+        order_id (int): ID заказа.
+
+    Returns:
+        Sequence[Dish]: Блюда заказа или пустой список, если заказа нет.
+    """
+    with SessionLocal() as session:
+        order = session.get(Order, order_id)
+        return list(order.dishes) if order else []
+
+
+@task_queue.handler("order_created")
+async def on_order_created(payload: Dict[str, Any]) -> None:
+    dishes = {dish.id: dish for dish in await asyncio.to_thread(load_dishes, payload["dish_ids"])}
+    lines = ", ".join(dishes[dish_id].name for dish_id in payload["dish_ids"] if dish_id in dishes)
+    logger.info(f"Кухонный тикет для заказа ID {payload['order_id']}: {lines}")
+
+
+@task_queue.handler("order_status_changed")
+async def on_order_status_changed(payload: Dict[str, Any]) -> None:
+    logger.info(f"Статус заказа ID {payload['order_id']} обновлён: "
+                f"'{payload['old_status']}' -> '{payload['new_status']}'")
+    if payload["new_status"] == "завершен":
+        dishes = await asyncio.to_thread(load_order_dishes, payload["order_id"])
+        total = sum(dish.price for dish in dishes)
+        logger.info(f"Чек по заказу ID {payload['order_id']}: позиций {len(dishes)}, сумма {total:.2f}")
+
+
+@task_queue.handler("order_cancelled")
+async def on_order_cancelled(payload: Dict[str, Any]) -> None:
+    logger.info(f"Заказ с ID {payload['order_id']} отменён")
@@ -1,14 +1,17 @@
 from fastapi import HTTPException
 from sqlalchemy.orm import Session
+from sqlalchemy import tuple_, text
 from sqlalchemy.future import select
 from sqlalchemy.orm import selectinload
 from datetime import datetime
-from typing import Sequence, List
+from typing import Sequence, List, Optional, Tuple
 
 from app.models.order import Order
 from app.models.dish import Dish
 from app.schemas.order import OrderCreate, OrderStatusUpdate
 from app.core.logger import logger
+from app.core.stats import live_stats
+from app.core.tasks import task_queue, add_event
 
 
 class OrderService:
@@ -41,6 +44,115 @@ class OrderService:
         logger.debug(f"Найдено заказов: {len(orders)}")
         return orders
 
+    @staticmethod
+    def encode_cursor(order: Order) -> str:
+        """
+        Сформировать курсор для следующей страницы из последнего заказа страницы.
+
+        Args:
+            order (Order): Последний заказ текущей страницы.
+
+        Returns:
+            str: Курсор вида "<order_time в ISO-формате>,<id>".
+        """
+        return f"{order.order_time.isoformat()},{order.id}"
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+        """
+        Разобрать курсор пагинации.
+
+        Args:
+            cursor (str): Курсор вида "<order_time в ISO-формате>,<id>".
+
+        Raises:
+            ValueError: Если курсор имеет неверный формат.
+
+        Returns:
+            Tuple[datetime, int]: Время и ID последнего заказа предыдущей страницы.
+        """
+        try:
+            order_time, order_id = cursor.rsplit(",", 1)
+            return datetime.fromisoformat(order_time), int(order_id)
+        except ValueError:
+            raise ValueError("Некорректный курсор пагинации")
+
+    async def get_by_customer(self, customer_name: str, limit: int,
+                              cursor: Optional[str] = None) -> Tuple[Sequence[Order], Optional[str]]:
+        """
+        Получить заказы клиента, от новых к старым, с keyset-пагинацией.
+
+        Запрос обслуживается индексом (customer_name, order_time DESC, id DESC),
+        поэтому время ответа не зависит от общего числа заказов.
+
+        Args:
+            customer_name (str): Имя клиента.
+            limit (int): Максимальное количество заказов на странице.
+            cursor (Optional[str]): Курсор, полученный с предыдущей страницы.
+
+        Raises:
+            ValueError: Если курсор имеет неверный формат.
+
+        Returns:
+            Tuple[Sequence[Order], Optional[str]]: Заказы страницы и курсор следующей страницы.
+        """
+        logger.info(f"Получение заказов клиента: {customer_name}")
+        query = (
+            select(Order)
+            .options(selectinload(Order.dishes))
+            .where(Order.customer_name == customer_name)
+        )
+        if cursor:
+            order_time, order_id = self.decode_cursor(cursor)
+            query = query.where(tuple_(Order.order_time, Order.id) < tuple_(order_time, order_id))
+        query = query.order_by(Order.order_time.desc(), Order.id.desc()).limit(limit + 1)
+
+        orders = self.session.execute(query).scalars().all()
+        next_cursor = None
+        if len(orders) > limit:
+            orders = orders[:limit]
+            next_cursor = self.encode_cursor(orders[-1])
+        logger.debug(f"Найдено заказов клиента {customer_name}: {len(orders)}")
+        return orders, next_cursor
+
+    async def search_customers(self, prefix: str, limit: int) -> Sequence[str]:
+        """
+        Найти имена клиентов, начинающиеся с указанного префикса.
+
+        Имена перебираются "прыжками" по индексу ix_orders_customer_name_order_time
+        (рекурсивный CTE): на каждое имя читается одна строка индекса, сколько бы
+        заказов ни было у клиента. Порядок операторов ~<~ / ~>~ совпадает
+        с порядком индекса (text_pattern_ops), поэтому сортировка не нужна.
+
+        Args:
+            prefix (str): Префикс имени клиента.
+            limit (int): Максимальное количество имён в ответе.
+
+        Returns:
+            Sequence[str]: Список имён клиентов в побайтовом порядке.
+        """
+        logger.info(f"Поиск клиентов по префиксу: {prefix}")
+        pattern = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+        result = self.session.execute(
+            text(
+                "WITH RECURSIVE names AS ("
+                " (SELECT customer_name FROM orders"
+                "  WHERE customer_name ~>=~ :prefix AND customer_name LIKE :pattern"
+                "  ORDER BY customer_name USING ~<~ LIMIT 1)"
+                " UNION ALL"
+                " SELECT (SELECT o.customer_name FROM orders o"
+                "  WHERE o.customer_name ~>~ n.customer_name AND o.customer_name LIKE :pattern"
+                "  ORDER BY o.customer_name USING ~<~ LIMIT 1)"
+                " FROM names n WHERE n.customer_name IS NOT NULL"
+                ")"
+                " SELECT customer_name FROM names WHERE customer_name IS NOT NULL LIMIT :limit"
+            ),
+            {"prefix": prefix, "pattern": pattern, "limit": limit},
+        )
+        names = result.scalars().all()
+        logger.debug(f"Найдено клиентов: {len(names)}")
+        return names
+
     async def create(self, order_create: OrderCreate) -> Order:
         """
         Создать новый заказ.
@@ -58,7 +170,7 @@ class OrderService:
         dishes = []
         for dish_id in order_create.dish_ids:
             dish = self.session.get(Dish, dish_id)
-            if not dish:
+            if not dish or not dish.is_active:
                 logger.warning(f"Блюдо с ID {dish_id} не найдено при создании заказа")
                 raise ValueError(f"Блюдо с id={dish_id} не найдено")
             dishes.append(dish)
@@ -70,7 +182,11 @@ class OrderService:
             dishes=dishes,
         )
         self.session.add(order)
+        self.session.flush()
+        add_event(self.session, "order_created",
+                  {"order_id": order.id, "dish_ids": [dish.id for dish in dishes]})
         self.session.commit()
+        task_queue.notify()
         self.session.refresh(order)
 
         result = self.session.execute(
@@ -79,8 +195,7 @@ class OrderService:
             .where(Order.id == order.id)
         )
         order = result.scalars().first()
-
-        logger.debug(f"Заказ создан с ID {order.id}")
+        live_stats.record_created(order.status, order.order_time, [dish.id for dish in order.dishes])
         return order
 
     async def delete(self, order_id: int) -> bool:
@@ -104,9 +219,12 @@ class OrderService:
         if order.status != "в обработке":
             logger.warning(f"Попытка удалить заказ с ID {order_id}, но его статус: {order.status}")
             raise ValueError("Отменить заказ можно только в статусе 'в обработке'")
+        dish_ids = [dish.id for dish in order.dishes]
         self.session.delete(order)
+        add_event(self.session, "order_cancelled", {"order_id": order_id})
         self.session.commit()
-        logger.debug(f"Заказ с ID {order_id} успешно удалён")
+        task_queue.notify()
+        live_stats.record_deleted(order.status, order.order_time, dish_ids)
         return True
 
     async def update_status(self, order_id: int, status_update: OrderStatusUpdate) -> Order:
@@ -155,9 +273,12 @@ class OrderService:
                        f"Допустимые переходы: '{allowed[0]}'!"
             )
 
+        old_status = order.status
         order.status = new_status
+        add_event(self.session, "order_status_changed",
+                  {"order_id": order_id, "old_status": old_status, "new_status": new_status})
         self.session.commit()
+        task_queue.notify()
         self.session.refresh(order)
-
-        logger.debug(f"Статус заказа ID {order_id} обновлён на '{new_status}'")
+        live_stats.record_status_change(old_status, new_status)
         return order
@@ -0,0 +1,57 @@
+"""
+Сравнение загрузки меню через POST /dishes/ (по одному блюду) и POST /dishes/import (CSV + COPY).
+
+Запуск при работающем приложении:
+    python benchmarks/bench_dish_import.py --url http://localhost:8000 --rows 2000
+"""
+import argparse
+import csv
+import io
+import time
+
+import httpx
+
+
+def make_dishes(rows: int) -> list[dict]:
+    return [
+        {"name": f"Блюдо {i}", "description": f"Описание {i}", "price": 100.0 + i, "category": "Бенчмарк"}
+        for i in range(rows)
+    ]
+
+
+def bench_per_row(client: httpx.Client, dishes: list[dict]) -> float:
+    start = time.perf_counter()
+    for dish in dishes:
+        client.post("/dishes/", json=dish).raise_for_status()
+    return time.perf_counter() - start
+
+
+def bench_import(client: httpx.Client, dishes: list[dict]) -> float:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=["name", "description", "price", "category"])
+    writer.writeheader()
+    writer.writerows(dishes)
+    start = time.perf_counter()
+    client.post("/dishes/import", content=buffer.getvalue().encode(),
+                headers={"Content-Type": "text/csv"}).raise_for_status()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--rows", type=int, default=1000)
+    args = parser.parse_args()
+
+    dishes = make_dishes(args.rows)
+    with httpx.Client(base_url=args.url, timeout=None) as client:
+        per_row = bench_per_row(client, dishes)
+        bulk = bench_import(client, dishes)
+
+    print(f"POST /dishes/ x {args.rows}: {per_row:.2f} с ({args.rows / per_row:.0f} строк/с)")
+    print(f"POST /dishes/import:       {bulk:.2f} с ({args.rows / bulk:.0f} строк/с)")
+    print(f"Ускорение: {per_row / bulk:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
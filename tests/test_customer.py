@@ -0,0 +1,43 @@
+from fastapi.testclient import TestClient
+from app.main import app
+
+client = TestClient(app)
+
+
+def test_get_customer_orders():
+    order_data = {
+        "customer_name": "Пётр Петров",
+        "dish_ids": [1]  # Нужно чтобы блюдо с id=1 существовало в тестовой БД
+    }
+    for _ in range(3):
+        assert client.post("/orders/", json=order_data).status_code == 200
+
+    response = client.get("/customers/Пётр Петров/orders", params={"limit": 2})
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data["items"]) == 2
+    assert all(item["customer_name"] == "Пётр Петров" for item in data["items"])
+    assert data["next_cursor"] is not None
+
+    next_page = client.get("/customers/Пётр Петров/orders",
+                           params={"limit": 2, "cursor": data["next_cursor"]})
+    assert next_page.status_code == 200
+    first_ids = {item["id"] for item in data["items"]}
+    assert all(item["id"] not in first_ids for item in next_page.json()["items"])
+
+
+def test_get_customer_orders_invalid_cursor():
+    response = client.get("/customers/Пётр Петров/orders", params={"cursor": "abc"})
+    assert response.status_code == 400
+
+
+def test_search_customers():
+    response = client.get("/customers/", params={"prefix": "Пётр"})
+    assert response.status_code == 200
+    assert "Пётр Петров" in response.json()
+
+
+def test_search_customers_escapes_wildcards():
+    response = client.get("/customers/", params={"prefix": "%"})
+    assert response.status_code == 200
+    assert response.json() == []
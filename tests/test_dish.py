@@ -1,6 +1,18 @@
+import asyncio
+import csv
+import io
+import threading
+import time
+import uuid
+
 import pytest
 from httpx import AsyncClient
+from sqlalchemy import text
 from app.main import app
+from app.core.database import SessionLocal
+from app.models.dish import Dish
+from app.schemas.dish import DishCreate
+from app.services.dish_service import DishService, MENU_WRITE_LOCK
 
 
 @pytest.mark.anyio
@@ -46,3 +58,187 @@ async def test_delete_dish():
 
         delete_resp_again = await ac.delete(f"/dishes/{dish_id}")
         assert delete_resp_again.status_code == 404
+
+        dishes_resp = await ac.get("/dishes/")
+        assert all(dish["id"] != dish_id for dish in dishes_resp.json())
+
+
+async def sync_menu(ac, version):
+    dishes = []
+    while True:
+        page = (await ac.get("/dishes/changes", params={"since_version": version})).json()
+        dishes += page["dishes"]
+        version = page["version"]
+        if not page["has_more"]:
+            return dishes, version
+
+
+@pytest.mark.anyio
+async def test_get_dish_changes():
+    new_dish = {
+        "name": "Солянка",
+        "description": "Густой суп с копчёностями",
+        "price": 6.20,
+        "category": "Супы"
+    }
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        _, version = await sync_menu(ac, 0)
+
+        dish_id = (await ac.post("/dishes/", json=new_dish)).json()["id"]
+        created, created_version = await sync_menu(ac, version)
+        assert [dish["id"] for dish in created] == [dish_id]
+        assert created[0]["is_active"] is True
+        assert created_version > version
+
+        await ac.delete(f"/dishes/{dish_id}")
+        deleted, _ = await sync_menu(ac, created_version)
+        assert [dish["id"] for dish in deleted] == [dish_id]
+        assert deleted[0]["is_active"] is False
+
+
+def menu_lock_waiters() -> int:
+    with SessionLocal() as session:
+        return session.execute(
+            text("SELECT count(*) FROM pg_locks"
+                 " WHERE locktype = 'advisory' AND classid = 0 AND objid = :key AND NOT granted"),
+            {"key": MENU_WRITE_LOCK},
+        ).scalar()
+
+
+async def wait_for_menu_lock_waiter(timeout: float = 10.0) -> None:
+    deadline = time.monotonic() + timeout
+    while await asyncio.to_thread(menu_lock_waiters) == 0:
+        assert time.monotonic() < deadline, "Писатель не ждёт блокировку меню"
+        await asyncio.sleep(0.05)
+
+
+@pytest.mark.anyio
+async def test_dish_changes_not_lost_with_interleaved_writers():
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        _, version = await sync_menu(ac, 0)
+
+    fast_ids = []
+
+    def write_fast():
+        with SessionLocal() as session:
+            dish = asyncio.run(DishService(session).create(
+                DishCreate(name="Быстрое блюдо", price=1.0, category="Тест")))
+            fast_ids.append(dish.id)
+
+    fast_writer = threading.Thread(target=write_fast)
+    slow_session = SessionLocal()
+    try:
+        # Первый писатель берёт версию и держит транзакцию открытой.
+        DishService(slow_session).lock_menu()
+        slow_dish = Dish(name="Медленное блюдо", price=1.0, category="Тест")
+        slow_session.add(slow_dish)
+        slow_session.flush()
+
+        # Второй писатель стартует позже и должен дождаться коммита первого.
+        fast_writer.start()
+        await wait_for_menu_lock_waiter()
+
+        async with AsyncClient(app=app, base_url="http://test") as ac:
+            visible, _ = await sync_menu(ac, version)
+        assert visible == []
+
+        slow_session.commit()
+        slow_id = slow_dish.id
+    finally:
+        slow_session.rollback()
+        slow_session.close()
+        if fast_writer.is_alive():
+            fast_writer.join(timeout=10)
+
+    assert not fast_writer.is_alive()
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        changed, _ = await sync_menu(ac, version)
+    assert [dish["id"] for dish in changed] == [slow_id, fast_ids[0]]
+
+
+@pytest.mark.anyio
+async def test_dish_write_during_import_does_not_block_event_loop():
+    new_dish = {"name": "Квас", "description": None, "price": 1.50, "category": "Напитки"}
+    headers = {"Content-Type": "text/csv"}
+    content = "name,price,category\nМорс,2.00,Напитки\n".encode()
+
+    # Эта сессия держит блокировку меню так же, как импорт во время diff и upsert.
+    holder = SessionLocal()
+    try:
+        DishService(holder).lock_menu()
+        async with AsyncClient(app=app, base_url="http://test") as ac:
+            create = asyncio.create_task(ac.post("/dishes/", json=new_dish))
+            await wait_for_menu_lock_waiter()
+
+            # Пока запись ждёт блокировку, цикл событий обслуживает другие запросы.
+            assert (await ac.get("/dishes/")).status_code == 200
+            assert not create.done()
+
+            holder.rollback()
+            assert (await create).status_code == 200
+    finally:
+        holder.rollback()
+        holder.close()
+
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        imported, created = await asyncio.gather(
+            ac.post("/dishes/import", headers=headers, content=content),
+            ac.post("/dishes/", json=new_dish),
+        )
+    assert imported.status_code == 200
+    assert imported.json()["inserted"] == 1
+    assert created.status_code == 200
+
+
+@pytest.mark.anyio
+async def test_import_dishes_dry_run():
+    content = "name,description,price,category\nОкрошка,Холодный суп,6.50,Супы\n"
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        response = await ac.post("/dishes/import", params={"dry_run": True}, content=content.encode(),
+                                 headers={"Content-Type": "text/csv"})
+    assert response.status_code == 200
+    assert response.json() == {"dry_run": True, "inserted": 1, "updated": 0, "unchanged": 0}
+
+
+@pytest.mark.anyio
+async def test_import_and_export_dishes_round_trip():
+    name = f"Суп дня {uuid.uuid4().hex[:8]}"
+    headers = {"Content-Type": "text/csv"}
+
+    def find(export_text):
+        return next(row for row in csv.DictReader(io.StringIO(export_text)) if row["name"] == name)
+
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        created = await ac.post("/dishes/import", headers=headers,
+                                content=f"name,description,price,category\n{name},Тыквенный,4.00,Супы\n".encode())
+        assert created.json() == {"dry_run": False, "inserted": 1, "updated": 0, "unchanged": 0}
+        dish_id = find((await ac.get("/dishes/export")).text)["id"]
+
+        # Колонки description нет в заголовке — описание должно сохраниться.
+        update_csv = f"id,name,price,category\n{dish_id},{name},4.50,Супы\n".encode()
+        updated = await ac.post("/dishes/import", headers=headers, content=update_csv)
+        assert updated.json() == {"dry_run": False, "inserted": 0, "updated": 1, "unchanged": 0}
+
+        unchanged = await ac.post("/dishes/import", headers=headers, content=update_csv)
+        assert unchanged.json() == {"dry_run": False, "inserted": 0, "updated": 0, "unchanged": 1}
+
+        row = find((await ac.get("/dishes/export")).text)
+    assert row == {"id": dish_id, "name": name, "description": "Тыквенный", "price": "4.5", "category": "Супы"}
+
+
+@pytest.mark.anyio
+async def test_import_dishes_invalid_header():
+    content = "title,price\nОкрошка,6.50\n"
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        response = await ac.post("/dishes/import", content=content.encode(),
+                                 headers={"Content-Type": "text/csv"})
+    assert response.status_code == 400
+
+
+@pytest.mark.anyio
+async def test_export_dishes():
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        response = await ac.get("/dishes/export")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert response.text.splitlines()[0] == "id,name,description,price,category"
@@ -0,0 +1,67 @@
+import time
+from fastapi.testclient import TestClient
+from app.main import app
+from datetime import datetime, timedelta
+from app.core.stats import SpaceSaving, LiveStats
+
+client = TestClient(app)
+
+
+def test_space_saving_keeps_heavy_hitters():
+    summary = SpaceSaving(capacity=2)
+    for key in [1, 1, 1, 2, 3, 1]:
+        summary.add(key)
+    assert len(summary.counts) == 2
+    assert summary.counts[1] == 4
+    assert summary.errors[1] == 0
+
+
+def test_snapshot_error_covers_evicted_buckets():
+    stats = LiveStats(capacity=2)
+    now = datetime.now()
+    earlier = now - timedelta(hours=1)
+    stats.record_created("в обработке", now, [1, 1, 1])
+    # Заполненная корзина без счётчика блюда 1: до 2 его заказов могли быть вытеснены.
+    stats.record_created("в обработке", earlier, [2, 2, 3, 3])
+
+    _, top = stats.snapshot(hours=2)
+    dish = next(item for item in top if item["dish_id"] == 1)
+    assert dish["count"] == 3
+    assert dish["error"] == 2
+
+
+def test_get_live_stats():
+    order_data = {
+        "customer_name": "Иван Иванов",
+        "dish_ids": [1]  # Нужно чтобы блюдо с id=1 существовало в тестовой БД
+    }
+    before = client.get("/stats/live").json()
+    assert client.post("/orders/", json=order_data).status_code == 200
+
+    response = client.get("/stats/live")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["status_counts"]["в обработке"] == before["status_counts"].get("в обработке", 0) + 1
+    assert any(dish["dish_id"] == 1 for dish in data["top_dishes"])
+
+
+def test_get_live_stats_invalid_window():
+    response = client.get("/stats/live", params={"hours": 0})
+    assert response.status_code == 422
+
+
+def test_order_events_processed_in_background():
+    order_data = {
+        "customer_name": "Иван Иванов",
+        "dish_ids": [1]  # Нужно чтобы блюдо с id=1 существовало в тестовой БД
+    }
+    with TestClient(app) as lifespan_client:
+        assert lifespan_client.post("/orders/", json=order_data).status_code == 200
+
+        for _ in range(50):
+            data = lifespan_client.get("/stats/tasks").json()
+            if data["processed"] > 0:
+                break
+            time.sleep(0.1)
+        assert data["processed"] > 0
+        assert data["queue_depth"] <= data["queue_size"]
@@ -0,0 +1,100 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.core.database import SessionLocal
+from app.core.tasks import TaskQueue, add_event, BACKOFF_BASE_SECONDS
+from app.models.outbox import OutboxEvent
+
+
+def create_event(event_type: str = "test_event") -> int:
+    with SessionLocal() as session:
+        event = add_event(session, event_type, {"value": 1})
+        session.commit()
+        return event.id
+
+
+def load_event(event_id: int) -> OutboxEvent:
+    with SessionLocal() as session:
+        return session.get(OutboxEvent, event_id)
+
+
+def failing_queue(max_attempts: int = 3) -> TaskQueue:
+    queue = TaskQueue(workers=1, maxsize=10, max_attempts=max_attempts)
+
+    @queue.handler("test_event")
+    async def fail(payload):
+        raise RuntimeError("boom")
+
+    return queue
+
+
+@pytest.mark.anyio
+async def test_failed_event_is_retried_with_backoff():
+    queue = failing_queue()
+    event_id = create_event()
+    event = load_event(event_id)
+
+    started = datetime.now()
+    await queue._handle(event_id, event.event_type, event.payload, event.created_at)
+
+    event = load_event(event_id)
+    assert event.attempts == 1
+    assert event.last_error == "boom"
+    assert event.processed_at is None
+    delay = (event.available_at - started).total_seconds()
+    assert BACKOFF_BASE_SECONDS * 2 <= delay < BACKOFF_BASE_SECONDS * 2 + 5
+    assert queue.failed == 1
+
+
+@pytest.mark.anyio
+async def test_event_becomes_dead_after_max_attempts():
+    queue = failing_queue(max_attempts=2)
+    event_id = create_event()
+    event = load_event(event_id)
+    with SessionLocal() as session:
+        dead_before = queue.metrics(session)["dead"]
+
+    for _ in range(2):
+        await queue._handle(event_id, event.event_type, event.payload, event.created_at)
+
+    with SessionLocal() as session:
+        # Даже когда задержка истекла, исчерпавшее попытки событие не забирается.
+        session.get(OutboxEvent, event_id).available_at = datetime.now() - timedelta(seconds=1)
+        session.commit()
+        assert queue.metrics(session)["dead"] == dead_before + 1
+    assert load_event(event_id).attempts == 2
+    assert event_id not in [claimed[0] for claimed in queue._claim(10000, [])]
+
+
+def test_claim_skips_inflight_events():
+    queue = TaskQueue(workers=1, maxsize=10)
+    queued_id = create_event()
+    new_id = create_event()
+
+    claimed = [event[0] for event in queue._claim(10000, [queued_id])]
+    assert queued_id not in claimed
+    assert new_id in claimed
+
+
+def test_renew_lease_skips_processed_events():
+    pending_id = create_event()
+    processed_id = create_event()
+    TaskQueue._mark_processed(processed_id)
+
+    assert TaskQueue._renew_lease(pending_id) is True
+    assert TaskQueue._renew_lease(processed_id) is False
+
+
+def test_delete_processed_keeps_recent_events():
+    old_id = create_event()
+    recent_id = create_event()
+    TaskQueue._mark_processed(old_id)
+    TaskQueue._mark_processed(recent_id)
+    with SessionLocal() as session:
+        session.get(OutboxEvent, old_id).processed_at = datetime.now() - timedelta(days=30)
+        session.commit()
+
+    assert TaskQueue._delete_processed(datetime.now() - timedelta(days=1)) >= 1
+    assert load_event(old_id) is None
+    assert load_event(recent_id) is not None